@@ -3,7 +3,9 @@ Flask Backend API
 Main application server for the Communication Skills Scoring System
 """
 from flask import Flask, request, jsonify, send_from_directory
+from flask.json.provider import JSONProvider
 from flask_cors import CORS
+import orjson
 import traceback
 from pathlib import Path
 import sys
@@ -15,12 +17,33 @@ sys.path.insert(0, str(backend_dir))
 from scoring_engine import get_scoring_engine
 from utils import validate_transcript, format_timestamp, load_sample_transcripts, get_score_category
 
+class OrjsonProvider(JSONProvider):
+    """JSON provider backed by orjson; serializes NumPy scalars and arrays natively"""
+    
+    option = orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+    
+    def dumps(self, obj, **kwargs):
+        return orjson.dumps(obj, option=self.option).decode()
+    
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+    
+    def response(self, *args, **kwargs):
+        obj = self._prepare_response_obj(args, kwargs)
+        return self._app.response_class(orjson.dumps(obj, option=self.option),
+                                        mimetype='application/json')
+
+
 # Initialize Flask app
 app = Flask(__name__, static_folder='../frontend', static_url_path='')
+app.json = OrjsonProvider(app)
+app.config['SEND_FILE_MAX_AGE_DEFAULT'] = 86400  # Let browsers cache frontend assets for a day
 CORS(app)  # Enable CORS for frontend-backend communication
 
 # Initialize scoring engine (will load on first request)
 scoring_engine = None
+# Sample transcripts as JSON-ready records (loaded on first request)
+sample_records = None
 
 def init_scoring_engine():
     """Initialize scoring engine lazily"""
@@ -35,6 +58,22 @@ def init_scoring_engine():
             raise
 
 
+@app.after_request
+def set_cache_headers(response):
+    """Cache static assets publicly; always revalidate the HTML page"""
+    if request.path.startswith('/api/'):
+        return response
+    if request.path == '/' or request.path.endswith('.html'):
+        # Drop the one-day caching send_from_directory applied to it
+        response.cache_control.max_age = None
+        response.cache_control.public = False
+        response.cache_control.no_cache = True
+        response.expires = None
+    elif response.status_code == 200:
+        response.cache_control.public = True
+    return response
+
+
 @app.route('/')
 def index():
     """Serve the main frontend page"""
@@ -74,8 +113,10 @@ def get_rubric():
 def get_samples():
     """Get sample transcripts"""
     try:
-        samples_df = load_sample_transcripts()
-        samples = samples_df.to_dict('records')
+        global sample_records
+        if sample_records is None:
+            sample_records = load_sample_transcripts().to_dict('records')
+        samples = sample_records
         return jsonify({
             'success': True,
             'data': samples,
@@ -191,26 +232,43 @@ def batch_score():
         # Initialize scoring engine
         init_scoring_engine()
         
-        # Score each transcript
-        results = []
+        # Validate every transcript first so the valid ones can be scored together
+        results = [None] * len(transcripts)
+        valid_ids = []
         for i, transcript in enumerate(transcripts):
             validation = validate_transcript(transcript)
             if validation['valid']:
-                try:
-                    score_result = scoring_engine.score_transcript(transcript)
-                    score_result['id'] = i + 1
-                    score_result['score_category'] = get_score_category(score_result['overall_score'])
-                    results.append(score_result)
-                except Exception as e:
-                    results.append({
-                        'id': i + 1,
-                        'error': str(e)
-                    })
+                valid_ids.append(i)
             else:
-                results.append({
+                results[i] = {
                     'id': i + 1,
                     'error': validation['message']
-                })
+                }
+        
+        # Score all valid transcripts in a single batch; failures stay per transcript
+        try:
+            score_results = scoring_engine.score_transcripts(
+                [transcripts[i] for i in valid_ids], return_exceptions=True
+            )
+        except Exception:
+            # The shared encode failed: score each transcript on its own instead
+            score_results = []
+            for i in valid_ids:
+                try:
+                    score_results.append(scoring_engine.score_transcript(transcripts[i]))
+                except Exception as e:
+                    score_results.append(e)
+        
+        for i, score_result in zip(valid_ids, score_results):
+            if isinstance(score_result, Exception):
+                results[i] = {
+                    'id': i + 1,
+                    'error': str(score_result)
+                }
+            else:
+                score_result['id'] = i + 1
+                score_result['score_category'] = get_score_category(score_result['overall_score'])
+                results[i] = score_result
         
         return jsonify({
             'success': True,
@@ -0,0 +1,114 @@
+"""
+Batching Module
+Micro-batches concurrent single-text encode requests into one model call
+"""
+import queue
+import threading
+import time
+from concurrent.futures import Future
+import numpy as np
+
+# Largest number of texts encoded together
+MAX_BATCH = 32
+# How long to hold a batch open for more texts under concurrent load (milliseconds)
+WAIT_MS = 20
+
+# Queue item telling the worker to exit
+_STOP = object()
+
+
+class BatchingEncoder:
+    """Collects texts submitted from many threads and encodes them together"""
+
+    def __init__(self, nlp, max_batch: int = MAX_BATCH, wait_ms: float = WAIT_MS):
+        """
+        Start the background encoding worker
+
+        Args:
+            nlp: NLPProcessor used to encode each batch
+            max_batch: Largest number of texts encoded together
+            wait_ms: How long to hold a batch open for more texts under concurrent load
+        """
+        self.nlp = nlp
+        self.max_batch = max_batch
+        self.wait = wait_ms / 1000.0
+        self._queue = queue.Queue()
+        self._last_batch_size = 1
+        self._worker = threading.Thread(target=self._run, name='batching-encoder', daemon=True)
+        self._worker.start()
+
+    def submit(self, text: str) -> Future:
+        """
+        Queue a text for encoding
+
+        Args:
+            text: Preprocessed text to encode
+
+        Returns:
+            Future resolving to the text's normalized embedding
+        """
+        future = Future()
+        self._queue.put((text, future))
+        return future
+
+    def encode(self, text: str) -> np.ndarray:
+        """
+        Get a text's normalized embedding, batching the encode with concurrent callers
+
+        Args:
+            text: Preprocessed text to encode
+
+        Returns:
+            Unit-length embedding vector
+        """
+        emb = self.nlp.lookup_embedding(text)
+        if emb is not None:
+            return emb  # Cache hit: no need to queue
+        return self.submit(text).result()
+
+    def close(self) -> None:
+        """Stop the worker once the texts queued so far have been encoded"""
+        self._queue.put(_STOP)
+        self._worker.join()
+
+    def _collect(self) -> list:
+        """
+        Block for one item, then gather more until the batch is full
+
+        A lone request is encoded right away; the batch is only held open for
+        up to `wait` seconds when the previous batch showed concurrent traffic.
+        """
+        batch = [self._queue.get()]
+        wait = self.wait if self._last_batch_size > 1 else 0.0
+        deadline = time.monotonic() + wait
+        while len(batch) < self.max_batch and batch[-1] is not _STOP:
+            remaining = deadline - time.monotonic()
+            try:
+                if remaining > 0:
+                    batch.append(self._queue.get(timeout=remaining))
+                else:
+                    batch.append(self._queue.get_nowait())
+            except queue.Empty:
+                break
+        self._last_batch_size = len(batch)
+        return batch
+
+    def _run(self) -> None:
+        """Worker loop: encode each collected batch and resolve its futures"""
+        running = True
+        while running:
+            batch = self._collect()
+            if batch[-1] is _STOP:
+                batch.pop()
+                running = False
+            if not batch:
+                continue
+
+            try:
+                embeddings = self.nlp.encode_batch([text for text, _ in batch])
+            except Exception as e:
+                for _, future in batch:
+                    future.set_exception(e)
+                continue
+            for (_, future), emb in zip(batch, embeddings):
+                future.set_result(emb)
@@ -5,25 +5,78 @@ Handles natural language processing tasks including:
 - Semantic similarity calculation
 - Text preprocessing
 """
+import os
 import re
-from typing import List, Dict, Any
+import sys
+import hashlib
+import threading
+from collections import OrderedDict
+from functools import lru_cache
+from typing import List, Dict, Any, Optional
 import numpy as np
+import torch
 from sentence_transformers import SentenceTransformer
 import nltk
 from nltk.corpus import stopwords
-from nltk.tokenize import word_tokenize, sent_tokenize
 
 # Download required NLTK data (will only download if not present)
-try:
-    nltk.data.find('tokenizers/punkt')
-except LookupError:
-    nltk.download('punkt', quiet=True)
-
 try:
     nltk.data.find('corpora/stopwords')
 except LookupError:
     nltk.download('stopwords', quiet=True)
 
+# Load the stopword corpus at import so no request pays for it
+_STOPWORDS = frozenset(sys.intern(w) for w in stopwords.words('english'))
+
+# Maximum number of embeddings kept in the per-processor cache
+EMBEDDING_CACHE_SIZE = 4096
+
+# Precompiled tokenizers (alphanumeric words, sentences ending in . ! or ?);
+# [^\W_] is the regex form of str.isalnum(), so accented letters stay in the word
+_WORD_RE = re.compile(r"[^\W_]+")
+_SENT_RE = re.compile(r"[^.!?]+[.!?]?")
+
+# Special characters to drop (group 1) or whitespace runs to collapse (group 2)
+_CLEAN_RE = re.compile(r"([^\w\s.,!?-])|(\s+)")
+
+
+def _configure_torch() -> None:
+    """Use a few intra-op threads and one inter-op thread for small CPU batches"""
+    torch.set_num_threads(min(4, os.cpu_count() or 1))
+    try:
+        torch.set_num_interop_threads(1)
+    except RuntimeError:
+        pass  # Can only be set once, before any parallel work has started
+
+
+@lru_cache(maxsize=None)
+def _load_model(model_name: str):
+    """
+    Load an encoder model once per process; later processors reuse it
+    
+    Args:
+        model_name: Name of the sentence-transformers model to use
+        
+    Returns:
+        SentenceTransformer, or OnnxEncoder when NIRMAAN_USE_ONNX=1
+    """
+    print(f"Loading NLP model: {model_name}...")
+    _configure_torch()
+    model = None
+    if os.environ.get('NIRMAAN_USE_ONNX') == '1':
+        try:
+            from onnx_encoder import OnnxEncoder
+            model = OnnxEncoder(model_name)
+            print("✓ Using int8 ONNX Runtime encoder")
+        except Exception as e:
+            # Missing packages, offline export, quantization or session errors
+            print(f"✗ ONNX Runtime encoder unavailable ({type(e).__name__}: {e}), "
+                  "falling back to sentence-transformers")
+    if model is None:
+        model = SentenceTransformer(model_name)
+    print("✓ NLP model loaded successfully")
+    return model
+
 
 class NLPProcessor:
     """Handles NLP operations for transcript analysis"""
@@ -35,10 +88,10 @@ class NLPProcessor:
         Args:
             model_name: Name of the sentence-transformers model to use
         """
-        print(f"Loading NLP model: {model_name}...")
-        self.model = SentenceTransformer(model_name)
-        self.stop_words = set(stopwords.words('english'))
-        print("✓ NLP model loaded successfully")
+        self.model = _load_model(model_name)
+        self.stop_words = _STOPWORDS
+        self._emb_cache = OrderedDict()
+        self._emb_cache_lock = threading.Lock()
     
     def preprocess_text(self, text: str) -> str:
         """
@@ -50,11 +103,9 @@ class NLPProcessor:
         Returns:
             Cleaned text
         """
-        # Remove extra whitespace
-        text = re.sub(r'\s+', ' ', text)
-        # Remove special characters but keep basic punctuation
-        text = re.sub(r'[^\w\s.,!?-]', '', text)
-        return text.strip()
+        # Collapse whitespace and remove special characters (keeping basic
+        # punctuation) in a single pass
+        return _CLEAN_RE.sub(lambda m: ' ' if m.lastindex == 2 else '', text).strip()
     
     def count_words(self, text: str) -> int:
         """
@@ -66,8 +117,7 @@ class NLPProcessor:
         Returns:
             Number of words
         """
-        words = word_tokenize(text.lower())
-        return len([w for w in words if w.isalnum()])
+        return len(_WORD_RE.findall(text.lower()))
     
     def extract_keywords(self, text: str, remove_stopwords: bool = True) -> List[str]:
         """
@@ -80,24 +130,109 @@ class NLPProcessor:
         Returns:
             List of keywords
         """
-        words = word_tokenize(text.lower())
+        words = _WORD_RE.findall(text.lower())
         if remove_stopwords:
-            keywords = [w for w in words if w.isalnum() and w not in self.stop_words]
-        else:
-            keywords = [w for w in words if w.isalnum()]
-        return keywords
+            return [w for w in words if w not in self.stop_words]
+        return words
+    
+    @staticmethod
+    def _cache_key(text: str) -> bytes:
+        """Hash text into a compact embedding cache key"""
+        return hashlib.blake2b(text.encode('utf-8'), digest_size=16).digest()
+    
+    def _cache_get(self, key: bytes):
+        """Return cached embedding for key (marking it recently used) or None"""
+        with self._emb_cache_lock:
+            emb = self._emb_cache.get(key)
+            if emb is not None:
+                self._emb_cache.move_to_end(key)
+            return emb
+    
+    def _cache_put(self, key: bytes, emb: np.ndarray) -> None:
+        """Store embedding, evicting the least recently used entry when full"""
+        emb.flags.writeable = False  # shared between callers
+        with self._emb_cache_lock:
+            self._emb_cache[key] = emb
+            self._emb_cache.move_to_end(key)
+            if len(self._emb_cache) > EMBEDDING_CACHE_SIZE:
+                self._emb_cache.popitem(last=False)
+    
+    def lookup_embedding(self, text: str) -> Optional[np.ndarray]:
+        """
+        Get a cached embedding without encoding on a miss
+        
+        Args:
+            text: Input text
+            
+        Returns:
+            Cached unit-length embedding, or None if the text has not been encoded yet
+        """
+        return self._cache_get(self._cache_key(text))
     
     def get_embedding(self, text: str) -> np.ndarray:
         """
-        Get sentence embedding for text
+        Get L2-normalized sentence embedding for text, reusing cached results
         
         Args:
             text: Input text
             
         Returns:
-            Embedding vector
+            Unit-length embedding vector (read-only, may be shared)
+        """
+        key = self._cache_key(text)
+        emb = self._cache_get(key)
+        if emb is None:
+            emb = self.encode_normalized(text)
+            self._cache_put(key, emb)
+        return emb
+    
+    def encode_normalized(self, text: str) -> np.ndarray:
+        """
+        Get L2-normalized sentence embedding for text
+        
+        Args:
+            text: Input text
+            
+        Returns:
+            Unit-length embedding vector (dot product equals cosine similarity)
+        """
+        with torch.inference_mode():
+            return self.model.encode(text, normalize_embeddings=True, convert_to_numpy=True)
+    
+    def encode_batch(self, texts: List[str], batch_size: int = 32) -> np.ndarray:
+        """
+        Get L2-normalized embeddings for several texts in one encode call
+        Cached texts are served from the embedding cache; only misses are encoded
+        
+        Args:
+            texts: Input texts
+            batch_size: Number of texts per forward pass
+            
+        Returns:
+            Matrix of shape (len(texts), dim) with one unit-length row per text
         """
-        return self.model.encode(text, convert_to_numpy=True)
+        keys = [self._cache_key(t) for t in texts]
+        rows = [self._cache_get(k) for k in keys]
+        
+        # Encode each distinct missing text once
+        missing = {}
+        for text, key, row in zip(texts, keys, rows):
+            if row is None and key not in missing:
+                missing[key] = text
+        
+        if missing:
+            with torch.inference_mode():
+                encoded = self.model.encode(list(missing.values()), batch_size=batch_size,
+                                            normalize_embeddings=True, convert_to_numpy=True)
+            # Copy each row so a cached entry does not pin the whole batch matrix
+            fresh = {key: emb.copy() for key, emb in zip(missing.keys(), encoded)}
+            for key, emb in fresh.items():
+                self._cache_put(key, emb)
+            rows = [fresh[k] if row is None else row for k, row in zip(keys, rows)]
+        
+        if not rows:
+            return np.empty((0, self.model.get_sentence_embedding_dimension()), dtype=np.float32)
+        return np.stack(rows)
     
     def calculate_similarity(self, text1: str, text2: str) -> float:
         """
@@ -110,15 +245,15 @@ class NLPProcessor:
         Returns:
             Similarity score (0-1)
         """
-        # Get embeddings
+        # Get normalized embeddings
         emb1 = self.get_embedding(text1)
         emb2 = self.get_embedding(text2)
         
-        # Calculate cosine similarity
-        similarity = np.dot(emb1, emb2) / (np.linalg.norm(emb1) * np.linalg.norm(emb2))
+        # Embeddings are unit length, so the dot product is the cosine similarity
+        similarity = np.dot(emb1, emb2)
         
         # Ensure value is between 0 and 1
-        return float(max(0.0, min(1.0, similarity)))
+        return float(np.clip(similarity, 0.0, 1.0))
     
     def find_keyword_matches(self, text: str, keywords: List[str]) -> Dict[str, Any]:
         """
@@ -132,17 +267,15 @@ class NLPProcessor:
             Dictionary with found and missing keywords
         """
         text_lower = text.lower()
-        text_words = set(word_tokenize(text_lower))
         
         found = []
         missing = []
         
+        # A keyword that is a whole word of the text is also a substring of it,
+        # so one substring test covers both phrase and single-word matches
         for keyword in keywords:
-            # Check both exact phrase and individual words
             if keyword.lower() in text_lower:
                 found.append(keyword)
-            elif keyword.lower() in text_words:
-                found.append(keyword)
             else:
                 missing.append(keyword)
         
@@ -162,15 +295,17 @@ class NLPProcessor:
         Returns:
             Dictionary with quality metrics
         """
-        sentences = sent_tokenize(text)
-        words = word_tokenize(text)
+        words = _WORD_RE.findall(text.lower())
+        word_count = len(words)
+        unique_words = len(set(words))
+        sentence_count = sum(1 for s in _SENT_RE.findall(text) if not s.isspace())
         
         return {
-            'word_count': len([w for w in words if w.isalnum()]),
-            'sentence_count': len(sentences),
-            'avg_sentence_length': len(words) / len(sentences) if sentences else 0,
-            'unique_words': len(set(w.lower() for w in words if w.isalnum())),
-            'vocabulary_richness': len(set(w.lower() for w in words if w.isalnum())) / len([w for w in words if w.isalnum()]) if words else 0
+            'word_count': word_count,
+            'sentence_count': sentence_count,
+            'avg_sentence_length': word_count / sentence_count if sentence_count else 0,
+            'unique_words': unique_words,
+            'vocabulary_richness': unique_words / word_count if word_count else 0
         }
     
     def extract_phrases(self, text: str, phrase_length: int = 2) -> List[str]:
@@ -184,8 +319,7 @@ class NLPProcessor:
         Returns:
             List of phrases
         """
-        words = word_tokenize(text.lower())
-        words = [w for w in words if w.isalnum()]
+        words = _WORD_RE.findall(text.lower())
         
         phrases = []
         for i in range(len(words) - phrase_length + 1):
@@ -208,8 +342,12 @@ class NLPProcessor:
         if not reference_texts:
             return 0.0
         
-        similarities = [self.calculate_similarity(text, ref) for ref in reference_texts]
-        return float(np.mean(similarities))
+        # One encode for the text, one batched encode for all references
+        text_emb = self.get_embedding(text)
+        ref_embs = self.encode_batch(reference_texts)
+        
+        # Unit-length embeddings: the dot product is the cosine similarity
+        return float(np.clip(ref_embs @ text_emb, 0.0, 1.0).mean())
 
 
 # Singleton instance
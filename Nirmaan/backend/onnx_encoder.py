@@ -0,0 +1,91 @@
+"""
+ONNX Encoder Module
+Optional int8-quantized ONNX Runtime backend for sentence embeddings.
+Enabled with NIRMAAN_USE_ONNX=1; mirrors the subset of the
+SentenceTransformer API used by NLPProcessor.
+"""
+import os
+from pathlib import Path
+from typing import List, Union
+import numpy as np
+
+# Where exported/quantized models are stored (override with NIRMAAN_ONNX_DIR)
+DEFAULT_ONNX_DIR = Path(__file__).parent.parent / "models" / "onnx"
+
+
+class OnnxEncoder:
+    """Sentence encoder running an int8-quantized ONNX export on CPU"""
+
+    def __init__(self, model_name: str = 'all-MiniLM-L6-v2', quantize: bool = True,
+                 max_seq_length: int = 256):
+        """
+        Export (on first use), quantize and load the model with ONNX Runtime
+
+        Args:
+            model_name: Name of the sentence-transformers model to export
+            quantize: Whether to run the dynamically int8-quantized model
+            max_seq_length: Maximum number of tokens per text
+        """
+        # Optional dependencies, only needed on this code path
+        from optimum.onnxruntime import ORTModelForFeatureExtraction
+        from transformers import AutoTokenizer
+
+        model_id = model_name if '/' in model_name else f'sentence-transformers/{model_name}'
+        export_dir = Path(os.environ.get('NIRMAAN_ONNX_DIR', DEFAULT_ONNX_DIR)) / model_id.replace('/', '__')
+
+        if not (export_dir / 'model.onnx').exists():
+            ORTModelForFeatureExtraction.from_pretrained(model_id, export=True).save_pretrained(export_dir)
+            AutoTokenizer.from_pretrained(model_id).save_pretrained(export_dir)
+
+        file_name = 'model.onnx'
+        if quantize:
+            file_name = 'model_quantized.onnx'
+            if not (export_dir / file_name).exists():
+                from onnxruntime.quantization import quantize_dynamic, QuantType
+                quantize_dynamic(str(export_dir / 'model.onnx'), str(export_dir / file_name),
+                                 weight_type=QuantType.QInt8)
+
+        self.model = ORTModelForFeatureExtraction.from_pretrained(
+            export_dir, file_name=file_name, provider='CPUExecutionProvider'
+        )
+        self.tokenizer = AutoTokenizer.from_pretrained(export_dir)
+        self.max_seq_length = max_seq_length
+
+    def get_sentence_embedding_dimension(self) -> int:
+        """Get the size of the produced embedding vectors"""
+        return self.model.config.hidden_size
+
+    def encode(self, sentences: Union[str, List[str]], batch_size: int = 32,
+               normalize_embeddings: bool = False, convert_to_numpy: bool = True) -> np.ndarray:
+        """
+        Encode texts into mean-pooled sentence embeddings
+
+        Args:
+            sentences: A single text or a list of texts
+            batch_size: Number of texts per forward pass
+            normalize_embeddings: Whether to L2-normalize the embeddings
+            convert_to_numpy: Kept for SentenceTransformer compatibility (always NumPy)
+
+        Returns:
+            Embedding vector for a single text, else matrix with one row per text
+        """
+        single = isinstance(sentences, str)
+        texts = [sentences] if single else list(sentences)
+
+        batches = []
+        for start in range(0, len(texts), batch_size):
+            tokens = self.tokenizer(texts[start:start + batch_size], padding=True, truncation=True,
+                                    max_length=self.max_seq_length, return_tensors='np')
+            hidden = self.model(**tokens).last_hidden_state
+
+            # Mean pooling over real (non-padding) tokens
+            mask = tokens['attention_mask'][..., None].astype(np.float32)
+            batches.append((hidden * mask).sum(axis=1) / np.maximum(mask.sum(axis=1), 1e-9))
+
+        embeddings = (np.concatenate(batches) if batches
+                      else np.empty((0, self.get_sentence_embedding_dimension()))).astype(np.float32)
+        if normalize_embeddings:
+            norms = np.linalg.norm(embeddings, axis=1, keepdims=True)
+            embeddings /= np.maximum(norms, 1e-12)
+
+        return embeddings[0] if single else embeddings
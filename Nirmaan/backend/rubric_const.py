@@ -0,0 +1,73 @@
+"""
+Default rubric definition
+Kept in code so the scoring engine can start without parsing Excel
+"""
+from typing import Any, Dict, Tuple
+
+# Rubric criteria based on case study requirements
+RUBRIC_ROWS: Tuple[Dict[str, Any], ...] = (
+    {
+        'Criterion': 'Salutation',
+        'Description': 'Quality of greeting at the beginning',
+        'Keywords': 'hello,hi,good morning,good afternoon,good evening,good day,excited,introduce,feeling great',
+        'Weight': 5,
+        'Min_Words': 1,
+        'Max_Words': 20
+    },
+    {
+        'Criterion': 'Key Information',
+        'Description': 'Presence of name, age, school, family, hobbies/interests',
+        'Keywords': 'name,myself,age,years old,class,school,family,mother,father,sister,brother,hobbies,interest,like,enjoy,love,play,favorite',
+        'Weight': 30,
+        'Min_Words': 20,
+        'Max_Words': 150
+    },
+    {
+        'Criterion': 'Flow',
+        'Description': 'Logical order: Salutation → Name → Details → Closing',
+        'Keywords': 'first,then,also,finally,thank you,thanks',
+        'Weight': 5,
+        'Min_Words': 0,
+        'Max_Words': 999
+    },
+    {
+        'Criterion': 'Speech Rate',
+        'Description': 'Appropriate speaking pace (words per minute)',
+        'Keywords': '',
+        'Weight': 10,
+        'Min_Words': 0,
+        'Max_Words': 999
+    },
+    {
+        'Criterion': 'Grammar',
+        'Description': 'Grammar correctness and proper sentence structure',
+        'Keywords': '',
+        'Weight': 10,
+        'Min_Words': 0,
+        'Max_Words': 999
+    },
+    {
+        'Criterion': 'Vocabulary',
+        'Description': 'Vocabulary richness and diversity (TTR)',
+        'Keywords': '',
+        'Weight': 10,
+        'Min_Words': 0,
+        'Max_Words': 999
+    },
+    {
+        'Criterion': 'Clarity',
+        'Description': 'Clear speech with minimal filler words',
+        'Keywords': 'um,uh,like,you know,so,actually,basically,right,i mean,well,kinda,sort of,okay,hmm,ah',
+        'Weight': 15,
+        'Min_Words': 0,
+        'Max_Words': 999
+    },
+    {
+        'Criterion': 'Engagement',
+        'Description': 'Positive sentiment, enthusiasm, and confidence',
+        'Keywords': 'excited,happy,love,enjoy,great,wonderful,amazing,passionate,enthusiastic,interested',
+        'Weight': 15,
+        'Min_Words': 0,
+        'Max_Words': 999
+    }
+)
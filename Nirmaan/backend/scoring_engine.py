@@ -3,23 +3,176 @@ Scoring Engine Module
 Core logic for scoring transcripts based on rubric criteria
 Combines rule-based, NLP-based, and rubric-driven approaches
 """
+import os
 from typing import Dict, List, Any, Optional
 import pandas as pd
 import numpy as np
+import ahocorasick
 from nlp_processor import get_nlp_processor
+from batching import BatchingEncoder
 from utils import (
-    load_rubric, parse_keywords, normalize_score, 
-    calculate_weighted_average, format_feedback, get_word_count_status
+    load_rubric, parse_keywords, format_feedback, SCORE_CATEGORY_NAMES
 )
 
+try:
+    from numba import njit, prange
+except ImportError:  # numba is optional; the kernels then run as plain Python
+    def njit(*args, **kwargs):
+        return lambda func: func
+    prange = range
+
+
+@njit(cache=True, fastmath=True)
+def _combine_scores(matches, occurrences, word_count, similarities,
+                    num_keywords, min_words, max_words, weights):
+    """
+    Compute rule-based, semantic, rubric-driven and combined scores for all criteria
+    
+    Args:
+        matches: Number of distinct keywords found, per criterion
+        occurrences: Total keyword occurrences, per criterion
+        word_count: Whitespace-separated word count of the transcript
+        similarities: Semantic similarity (0-1) to each criterion description
+        num_keywords: Number of keywords defined, per criterion
+        min_words: Minimum expected words, per criterion
+        max_words: Maximum expected words, per criterion
+        weights: Criterion weights
+        
+    Returns:
+        Tuple of (rule, semantic, rubric, final) score arrays and the weighted overall score
+    """
+    n = matches.shape[0]
+    rule = np.empty(n)
+    semantic = np.empty(n)
+    rubric = np.empty(n)
+    final = np.empty(n)
+    
+    for i in range(n):
+        # 1. Rule-based (40%): keyword presence (70) + word count compliance (30)
+        if num_keywords[i] > 0:
+            keyword_score = 70.0 * matches[i] / num_keywords[i]
+        else:
+            keyword_score = 35.0  # Base score if no keywords defined
+        
+        if (min_words[i] <= 0 and max_words[i] >= 999) or min_words[i] <= word_count <= max_words[i]:
+            length_score = 30.0  # Full credit within limits or if no limits
+        elif word_count < min_words[i]:
+            length_score = 30.0 * min(word_count / min_words[i], 1.0)  # Partial credit
+        else:
+            length_score = 20.0  # Slight penalty for being too verbose
+        rule[i] = min(100.0, max(0.0, keyword_score + length_score))
+        
+        # 2. Semantic (40%): non-linear curve rewarding high similarity
+        sim = similarities[i]
+        if sim >= 0.7:
+            sem = 70.0 + (sim - 0.7) * 100.0  # 70-100 range for high similarity
+        elif sim >= 0.4:
+            sem = 40.0 + (sim - 0.4) * 100.0  # 40-70 range for medium similarity
+        else:
+            sem = sim * 100.0  # 0-40 range for low similarity
+        semantic[i] = min(100.0, max(0.0, sem))
+        
+        # 3. Rubric-driven (20%): keyword density (capped at 50) + coverage (50)
+        if num_keywords[i] > 0:
+            density = min(50.0, occurrences[i] * 10.0)
+            coverage = 50.0 * matches[i] / num_keywords[i]
+            rubric[i] = min(100.0, max(0.0, density + coverage))
+        else:
+            rubric[i] = 50.0  # Neutral score if no keywords
+        
+        final[i] = min(100.0, max(0.0, 0.4 * rule[i] + 0.4 * semantic[i] + 0.2 * rubric[i]))
+    
+    total_weight = weights.sum()
+    overall = 0.0
+    if total_weight != 0:
+        overall = (final * weights).sum() / total_weight
+    return rule, semantic, rubric, final, overall
+
+
+@njit(parallel=True, fastmath=True, cache=True)
+def _categorize_clip(scores, out_idx, out_clipped):
+    """
+    Clamp each score to 0-100 and compute its category index into SCORE_CATEGORY_NAMES
+    
+    Args:
+        scores: Float64 array of raw scores
+        out_idx: Int64 output array for category indices
+        out_clipped: Float64 output array for clamped scores
+    """
+    for i in prange(scores.shape[0]):
+        s = scores[i]
+        if s < 0.0:
+            s = 0.0
+        elif s > 100.0:
+            s = 100.0
+        out_clipped[i] = s
+        # Comparisons summed as integers (no branch ladder) so the loop vectorizes
+        out_idx[i] = (int(s >= 50.0) + int(s >= 60.0) + int(s >= 70.0)
+                      + int(s >= 80.0) + int(s >= 90.0))
+
+
+def clip_and_categorize(scores) -> tuple:
+    """
+    Clamp many scores to 0-100 and categorize them in one compiled pass
+    
+    Args:
+        scores: List, Series or array of raw scores
+        
+    Returns:
+        Tuple of (category string array, clamped float array)
+    """
+    scores = np.ascontiguousarray(scores, dtype=np.float64)
+    idx = np.empty(scores.shape[0], dtype=np.int64)
+    clipped = np.empty(scores.shape[0], dtype=np.float64)
+    _categorize_clip(scores, idx, clipped)
+    return SCORE_CATEGORY_NAMES[idx], clipped
+
 
 class ScoringEngine:
     """Main scoring engine for transcript analysis"""
     
-    def __init__(self):
-        """Initialize scoring engine with NLP processor and rubric"""
+    def __init__(self, rubric_file: Optional[str] = None):
+        """
+        Initialize scoring engine with NLP processor and rubric
+        
+        Args:
+            rubric_file: Optional Excel file with a 'Rubric' sheet overriding the
+                built-in rubric (default: NIRMAAN_RUBRIC_FILE env var, if set)
+        """
         self.nlp = get_nlp_processor()
-        self.rubric = load_rubric()
+        self.rubric = load_rubric(rubric_file or os.environ.get('NIRMAAN_RUBRIC_FILE'))
+        
+        # Parse the rubric once into per-column lists/arrays for the scoring loop
+        self.criteria = self.rubric['Criterion'].tolist()
+        self.descriptions = self.rubric['Description'].tolist()
+        self.keywords = [tuple(parse_keywords(r)) for r in self.rubric['Keywords']]
+        self.weights = self.rubric['Weight'].to_numpy()
+        self.min_words = self.rubric.get('Min_Words', pd.Series(0, index=self.rubric.index)).to_numpy()
+        self.max_words = self.rubric.get('Max_Words', pd.Series(999, index=self.rubric.index)).to_numpy()
+        
+        # Float copies with stable dtypes for the compiled scoring kernel
+        self._kernel_args = tuple(
+            np.asarray(a, dtype=np.float64) for a in (self.min_words, self.max_words, self.weights)
+        )
+        
+        # Criterion descriptions are fixed, so they are encoded once here
+        self.desc_emb = self.nlp.encode_batch(self.descriptions)
+        
+        # One keyword automaton over all criteria: a single scan counts every keyword
+        self._build_keyword_index(self.keywords)
+        
+        # Static rubric summary served by get_rubric_info
+        self._rubric_info = {
+            'criteria_count': len(self.criteria),
+            'total_weight': self.weights.sum(),
+            'criteria': [
+                {'name': name, 'weight': weight, 'keyword_count': len(keywords)}
+                for name, weight, keywords in zip(self.criteria, self.weights, self.keywords)
+            ]
+        }
+        
+        # Merges single-transcript encodes from concurrent requests into one model call
+        self.batcher = BatchingEncoder(self.nlp)
         print(f"✓ Scoring engine initialized with {len(self.rubric)} criteria")
     
     def score_transcript(self, transcript: str) -> Dict[str, Any]:
@@ -34,81 +187,212 @@ class ScoringEngine:
         """
         # Preprocess transcript
         transcript = self.nlp.preprocess_text(transcript)
+        
+        sims = self.desc_emb @ self.batcher.encode(transcript)
+        return self._score_preprocessed(transcript, sims)
+    
+    def score_transcripts(self, transcripts: List[str],
+                          return_exceptions: bool = False) -> List[Any]:
+        """
+        Score several transcripts with a single batched encode
+        
+        Args:
+            transcripts: Texts of the transcripts to score
+            return_exceptions: If True, a transcript that fails to score yields its
+                exception in place of a result instead of failing the whole batch
+            
+        Returns:
+            List of result dictionaries (or exceptions), in the same order as the input
+        """
+        cleaned = [self.nlp.preprocess_text(t) for t in transcripts]
+        if not cleaned:
+            return []
+        
+        similarities = self._similarities(cleaned)
+        results = []
+        for transcript, sims in zip(cleaned, similarities):
+            try:
+                results.append(self._score_preprocessed(transcript, sims))
+            except Exception as e:
+                if not return_exceptions:
+                    raise
+                results.append(e)
+        return results
+    
+    def _similarities(self, transcripts: List[str]) -> np.ndarray:
+        """
+        Compute semantic similarity of each transcript to each criterion description
+        
+        Args:
+            transcripts: Preprocessed transcript texts
+            
+        Returns:
+            Matrix of shape (len(transcripts), num_criteria)
+        """
+        t_embs = self.nlp.encode_batch(transcripts)
+        
+        # One GEMM against all cached description embeddings
+        return t_embs @ self.desc_emb.T
+    
+    def _score_preprocessed(self, transcript: str, sims: np.ndarray) -> Dict[str, Any]:
+        """
+        Build the scoring result for an already preprocessed transcript
+        
+        Args:
+            transcript: Preprocessed transcript text
+            sims: Similarity of the transcript to each criterion description
+            
+        Returns:
+            Dictionary with overall score and detailed per-criterion results
+        """
         transcript_lower = transcript.lower()
         
-        # Get overall text quality metrics
+        # Get overall text quality metrics; its word count is shared by all criteria
         text_quality = self.nlp.analyze_text_quality(transcript)
+        word_count = text_quality['word_count']
+        word_count_statuses = self._word_count_statuses(word_count)
+        
+        # Keyword statistics for every criterion from one scan of the transcript
+        slot_counts = self._keyword_counts(transcript_lower)
+        num_criteria = len(self.criteria)
+        matches = np.bincount(self._kw_criterion, weights=slot_counts > 0, minlength=num_criteria)
+        occurrences = np.bincount(self._kw_criterion, weights=slot_counts, minlength=num_criteria)
+        similarities = np.clip(sims, 0.0, 1.0).astype(np.float64)
         
-        # Score each criterion
+        # Score and combine all criteria in one compiled pass
+        rule_scores, semantic_scores, rubric_scores, final_scores, overall_score = _combine_scores(
+            matches, occurrences, float(len(transcript_lower.split())), similarities,
+            self._kw_total, *self._kernel_args
+        )
+        
+        # Build per-criterion details
         criteria_scores = []
         
-        for _, row in self.rubric.iterrows():
-            criterion_result = self._score_criterion(
-                transcript=transcript,
-                transcript_lower=transcript_lower,
-                criterion_name=row['Criterion'],
-                description=row['Description'],
-                keywords=parse_keywords(row['Keywords']),
-                weight=row['Weight'],
-                min_words=row.get('Min_Words', 0),
-                max_words=row.get('Max_Words', 999)
+        for i in range(len(self.criteria)):
+            criterion_result = self._criterion_result(
+                criterion_name=self.criteria[i],
+                weight=self.weights[i],
+                keywords=self.keywords[i],
+                keyword_counts=slot_counts[self._kw_offsets[i]:self._kw_offsets[i + 1]],
+                similarity=similarities[i],
+                final_score=final_scores[i],
+                breakdown=(rule_scores[i], semantic_scores[i], rubric_scores[i]),
+                word_count=word_count,
+                word_count_status=word_count_statuses[i],
+                min_words=self.min_words[i],
+                max_words=self.max_words[i]
             )
             criteria_scores.append(criterion_result)
         
-        # Calculate overall score
-        scores = [c['score'] for c in criteria_scores]
-        weights = [c['weight'] for c in criteria_scores]
-        overall_score = calculate_weighted_average(scores, weights)
-        
         # Compile final result
         result = {
             'overall_score': round(overall_score, 2),
-            'word_count': text_quality['word_count'],
+            'word_count': word_count,
             'criteria_scores': criteria_scores,
             'text_quality': text_quality
         }
         
         return result
     
-    def _score_criterion(self, transcript: str, transcript_lower: str, 
-                        criterion_name: str, description: str, 
-                        keywords: List[str], weight: float,
-                        min_words: int = 0, max_words: int = 999) -> Dict[str, Any]:
+    def _build_keyword_index(self, keyword_lists: List[tuple]) -> None:
+        """
+        Lay out all criteria keywords as flat slots and build one automaton over them
+        
+        Args:
+            keyword_lists: Lowercase keywords of each criterion, in rubric order
+        """
+        lengths = [len(kws) for kws in keyword_lists]
+        self._kw_offsets = np.concatenate(([0], np.cumsum(lengths))).astype(int)
+        self._kw_criterion = np.repeat(np.arange(len(keyword_lists)), lengths)
+        self._kw_total = np.array(lengths, dtype=float)
+        
+        # Lowercase keyword -> every slot (criterion, position) it occupies
+        self._kw_slots = {}
+        for slot, kw in enumerate(kw for kws in keyword_lists for kw in kws):
+            self._kw_slots.setdefault(kw, []).append(slot)
+        
+        self._kw_automaton = None
+        if self._kw_slots:
+            self._kw_automaton = ahocorasick.Automaton()
+            for kw_lower in self._kw_slots:
+                self._kw_automaton.add_word(kw_lower, kw_lower)
+            self._kw_automaton.make_automaton()
+    
+    def _keyword_counts(self, transcript_lower: str) -> np.ndarray:
         """
-        Score a single criterion using multiple approaches
+        Count occurrences of every keyword slot with one pass over the transcript
+        
+        Args:
+            transcript_lower: Lowercase transcript
+            
+        Returns:
+            Occurrence count for each keyword slot
+        """
+        counts = np.zeros(self._kw_offsets[-1])
+        if self._kw_automaton is None:
+            return counts
+        
+        hits = {}
+        for _, kw_lower in self._kw_automaton.iter(transcript_lower):
+            hits[kw_lower] = hits.get(kw_lower, 0) + 1
+        for kw_lower, count in hits.items():
+            counts[self._kw_slots[kw_lower]] = count
+        return counts
+    
+    def _word_count_statuses(self, word_count: int) -> List[str]:
+        """
+        Determine the word count status against every criterion's limits
+        
+        Args:
+            word_count: Word count of the transcript
+            
+        Returns:
+            'too_short', 'within_range', 'too_long' or 'no_limit', per criterion
+        """
+        min_words, max_words = self.min_words, self.max_words
+        statuses = np.where(
+            (min_words == 0) & (max_words >= 999), 'no_limit',
+            np.where(word_count < min_words, 'too_short',
+                     np.where(word_count > max_words, 'too_long', 'within_range'))
+        )
+        return statuses.tolist()
+    
+    def _criterion_result(self, criterion_name: str, weight: float,
+                          keywords: tuple, keyword_counts: np.ndarray, similarity: float,
+                          final_score: float, breakdown: tuple,
+                          word_count: int, word_count_status: str,
+                          min_words: int = 0, max_words: int = 999) -> Dict[str, Any]:
+        """
+        Assemble the details and feedback for a single scored criterion
         
         Args:
-            transcript: Full transcript text
-            transcript_lower: Lowercase version for matching
             criterion_name: Name of the criterion
-            description: Description of what the criterion measures
-            keywords: List of keywords to check
             weight: Weight of this criterion
+            keywords: Tuple of this criterion's keywords
+            keyword_counts: Occurrences of each keyword in the transcript
+            similarity: Semantic similarity (0-1) to the criterion description
+            final_score: Combined criterion score (0-100)
+            breakdown: Tuple of (rule_based, semantic, rubric_driven) scores
+            word_count: Word count of the transcript
+            word_count_status: Status of the word count against this criterion's limits
             min_words: Minimum expected words for this criterion
             max_words: Maximum expected words for this criterion
             
         Returns:
             Dictionary with criterion score and details
         """
-        # 1. Rule-Based Scoring (40%)
-        rule_score = self._rule_based_score(transcript_lower, keywords, min_words, max_words)
-        
-        # 2. NLP-Based Semantic Scoring (40%)
-        semantic_score, similarity = self._semantic_score(transcript, description)
-        
-        # 3. Rubric-Driven Scoring (20%) - based on keyword density and coverage
-        rubric_score = self._rubric_driven_score(transcript_lower, keywords)
+        rule_score, semantic_score, rubric_score = breakdown
         
-        # Combine scores
-        combined_score = (rule_score * 0.4) + (semantic_score * 0.4) + (rubric_score * 0.2)
-        final_score = normalize_score(combined_score)
-        
-        # Find keyword matches
-        keyword_matches = self.nlp.find_keyword_matches(transcript, keywords)
-        
-        # Get word count status
-        word_count = self.nlp.count_words(transcript)
-        word_count_status = get_word_count_status(word_count, min_words, max_words)
+        # Split keywords into found/missing in one pass over the precomputed counts
+        found = []
+        missing = []
+        for kw, count in zip(keywords, keyword_counts.tolist()):
+            (found if count else missing).append(kw)
+        keyword_matches = {
+            'found': found,
+            'missing': missing,
+            'match_rate': len(found) / len(keywords) if keywords else 0
+        }
         
         # Generate feedback
         feedback = format_feedback(
@@ -139,106 +423,6 @@ class ScoringEngine:
             }
         }
     
-    def _rule_based_score(self, transcript_lower: str, keywords: List[str], 
-                         min_words: int, max_words: int) -> float:
-        """
-        Calculate score based on rules and exact matches
-        
-        Args:
-            transcript_lower: Lowercase transcript
-            keywords: Keywords to check
-            min_words: Minimum word requirement
-            max_words: Maximum word requirement
-            
-        Returns:
-            Rule-based score (0-100)
-        """
-        score = 0.0
-        
-        # Keyword presence (70% of rule score)
-        if keywords:
-            matches = sum(1 for kw in keywords if kw.lower() in transcript_lower)
-            keyword_score = (matches / len(keywords)) * 70
-            score += keyword_score
-        else:
-            score += 35  # Base score if no keywords defined
-        
-        # Word count compliance (30% of rule score)
-        word_count = len(transcript_lower.split())
-        if min_words > 0 or max_words < 999:
-            if min_words <= word_count <= max_words:
-                score += 30
-            elif word_count < min_words:
-                # Partial credit based on how close to minimum
-                ratio = word_count / min_words if min_words > 0 else 1
-                score += 30 * min(ratio, 1.0)
-            else:  # word_count > max_words
-                # Slight penalty for being too verbose
-                score += 20
-        else:
-            score += 30  # Full credit if no limits
-        
-        return normalize_score(score)
-    
-    def _semantic_score(self, transcript: str, description: str) -> tuple:
-        """
-        Calculate semantic similarity score using NLP
-        
-        Args:
-            transcript: Full transcript
-            description: Criterion description
-            
-        Returns:
-            Tuple of (score, similarity) where score is 0-100 and similarity is 0-1
-        """
-        # Calculate semantic similarity
-        similarity = self.nlp.calculate_similarity(transcript, description)
-        
-        # Convert similarity (0-1) to score (0-100) with a curve
-        # We use a non-linear scaling to reward high similarity more
-        if similarity >= 0.7:
-            score = 70 + (similarity - 0.7) * 100  # 70-100 range for high similarity
-        elif similarity >= 0.4:
-            score = 40 + (similarity - 0.4) * 100  # 40-70 range for medium similarity
-        else:
-            score = similarity * 100  # 0-40 range for low similarity
-        
-        return normalize_score(score), similarity
-    
-    def _rubric_driven_score(self, transcript_lower: str, keywords: List[str]) -> float:
-        """
-        Calculate score based on rubric-specific criteria
-        This includes keyword density and distribution
-        
-        Args:
-            transcript_lower: Lowercase transcript
-            keywords: List of keywords
-            
-        Returns:
-            Rubric-driven score (0-100)
-        """
-        if not keywords:
-            return 50.0  # Neutral score if no keywords
-        
-        score = 0.0
-        
-        # Count total keyword occurrences (not just unique)
-        total_occurrences = sum(transcript_lower.count(kw.lower()) for kw in keywords)
-        
-        # Keyword density (50% of rubric score)
-        # More occurrences = better, but with diminishing returns
-        if total_occurrences > 0:
-            density_score = min(50, total_occurrences * 10)  # Cap at 50
-            score += density_score
-        
-        # Keyword coverage (50% of rubric score)
-        # What percentage of keywords appear at least once
-        present_keywords = sum(1 for kw in keywords if kw.lower() in transcript_lower)
-        coverage = present_keywords / len(keywords)
-        score += coverage * 50
-        
-        return normalize_score(score)
-    
     def get_rubric_info(self) -> Dict[str, Any]:
         """
         Get information about the loaded rubric
@@ -246,18 +430,7 @@ class ScoringEngine:
         Returns:
             Dictionary with rubric information
         """
-        return {
-            'criteria_count': len(self.rubric),
-            'total_weight': self.rubric['Weight'].sum(),
-            'criteria': [
-                {
-                    'name': row['Criterion'],
-                    'weight': row['Weight'],
-                    'keyword_count': len(parse_keywords(row['Keywords']))
-                }
-                for _, row in self.rubric.iterrows()
-            ]
-        }
+        return self._rubric_info
 
 
 # Singleton instance
@@ -1,48 +1,173 @@
 """
 Utility functions for the scoring system
 """
-import pandas as pd
+import sys
+import numpy as np
+from bisect import bisect_right
+from datetime import datetime, timezone
+from functools import lru_cache
 from pathlib import Path
-from typing import Dict, List, Any, Optional
+from typing import Dict, List, Any, Optional, TYPE_CHECKING
+from rubric_const import RUBRIC_ROWS
 
+# pandas/openpyxl are imported inside the functions that need them, so importing
+# utils for validation or scoring helpers does not pay for them
+if TYPE_CHECKING:
+    import pandas as pd
 
-def load_rubric(file_path: str = None) -> pd.DataFrame:
+DEFAULT_DATA_FILE = Path(__file__).parent.parent / "data" / "Case study for interns.xlsx"
+# Side file written by setup_rubric.py; preferred over the original workbook when present
+SIDECAR_DATA_FILE = Path(__file__).parent.parent / "data" / "scoring_data.xlsx"
+
+# Column dtypes for rubric DataFrames (Arrow-backed strings, small integers)
+_RUBRIC_DTYPES = {
+    'Criterion': 'string[pyarrow]',
+    'Description': 'string[pyarrow]',
+    'Keywords': 'string[pyarrow]',
+    'Weight': 'int16[pyarrow]',
+    'Min_Words': 'int16[pyarrow]',
+    'Max_Words': 'int16[pyarrow]',
+}
+
+# Score category ladder: a score at or above _CUTS[i] falls into _NAMES[i + 1]
+_CUTS = (50, 60, 70, 80, 90)
+_NAMES = ('Needs Improvement', 'Fair', 'Satisfactory', 'Good', 'Very Good', 'Excellent')
+# The same names as an array, for vectorized category lookups
+SCORE_CATEGORY_NAMES = np.array(_NAMES)
+
+# Feedback ladders, indexed the same way with bisect_right
+_PERF_CUTS = (40, 60, 75, 90)
+_PERF_MSGS = (
+    "Requires significant improvement.",
+    "Needs improvement.",
+    "Satisfactory performance.",
+    "Good performance.",
+    "Excellent performance.",
+)
+_SEM_CUTS = (0.5, 0.75)
+_SEM_MSGS = (
+    "Consider addressing this aspect more directly.",
+    "Moderate semantic relevance.",
+    "Strong semantic alignment with criterion.",
+)
+
+# Feedback sentence templates, bound once
+_TPL_KW_MANY = "Strong keyword coverage with terms like '{0}', '{1}', and {2} more.".format
+_TPL_KW_FEW = "Found keywords: {0}.".format
+_TPL_MISSING_FEW = "Consider including: {0}.".format
+_TPL_MISSING_MANY = "Missing {0} suggested keywords.".format
+_TPL_BRIEF = "Content is brief ({0} words). Consider expanding (recommended: {1}+ words).".format
+_TPL_LENGTHY = "Content is lengthy ({0} words). Consider being more concise (recommended: under {1} words).".format
+_TPL_GOOD_LENGTH = "Good length ({0} words).".format
+
+
+@lru_cache(maxsize=4)
+def _read_workbook(file_path: str, mtime: float) -> Dict[str, tuple]:
+    """
+    Read every sheet's cell values once, skipping openpyxl's style/formula objects
+    
+    Args:
+        file_path: Path to Excel file
+        mtime: File modification time; part of the cache key so edits are picked up
+        
+    Returns:
+        Mapping of sheet name to a tuple of row tuples (header row first)
+    """
+    from openpyxl import load_workbook
+    
+    wb = load_workbook(file_path, read_only=True, data_only=True)
+    try:
+        sheets = {}
+        for ws in wb.worksheets:
+            rows = list(ws.values)
+            # Read-only sheets can report trailing blank rows past the data
+            while rows and all(v is None for v in rows[-1]):
+                rows.pop()
+            sheets[ws.title] = tuple(rows)
+        return sheets
+    finally:
+        wb.close()
+
+
+def _read_sheet(file_path, sheet_name: str) -> 'pd.DataFrame':
     """
-    Load rubric data from Excel file
+    Build a DataFrame for one sheet from the cached workbook values
     
     Args:
-        file_path: Path to Excel file (default: data/Case study for interns.xlsx)
+        file_path: Path to Excel file
+        sheet_name: Name of the sheet to read
+        
+    Returns:
+        DataFrame with the sheet data
+    """
+    import pandas as pd
+    
+    path = Path(file_path)
+    sheets = _read_workbook(str(path), path.stat().st_mtime)
+    if sheet_name not in sheets:
+        raise ValueError(f"Worksheet named '{sheet_name}' not found")
+    
+    rows = sheets[sheet_name]
+    if not rows:
+        return pd.DataFrame()
+    return pd.DataFrame(list(rows[1:]), columns=list(rows[0]))
+
+
+def load_rubric(file_path: str = None) -> 'pd.DataFrame':
+    """
+    Load rubric data
+    
+    Args:
+        file_path: Optional path to an Excel file with a 'Rubric' sheet
+            (default: the built-in rubric from rubric_const, no file I/O)
         
     Returns:
         DataFrame with rubric data
     """
     if file_path is None:
-        file_path = Path(__file__).parent.parent / "data" / "Case study for interns.xlsx"
+        import pandas as pd
+        return _typed_rubric(pd.DataFrame(list(RUBRIC_ROWS)))
     
     try:
-        df = pd.read_excel(file_path, sheet_name='Rubric')
-        return df
+        df = _read_sheet(file_path, 'Rubric')
+        return _typed_rubric(df)
     except FileNotFoundError:
         raise FileNotFoundError(f"Rubric file not found at {file_path}")
     except Exception as e:
         raise Exception(f"Error loading rubric: {str(e)}")
 
 
-def load_sample_transcripts(file_path: str = None) -> pd.DataFrame:
+def _typed_rubric(df: 'pd.DataFrame') -> 'pd.DataFrame':
+    """
+    Cast the known rubric columns to their compact dtypes
+    
+    Args:
+        df: Rubric DataFrame with default (object/int64) dtypes
+        
+    Returns:
+        DataFrame with Arrow-backed string and int16 columns
+    """
+    if 'Keywords' in df:
+        df['Keywords'] = df['Keywords'].fillna('')  # Blank cells become '' rather than <NA>
+    return df.astype({col: dtype for col, dtype in _RUBRIC_DTYPES.items() if col in df})
+
+
+def load_sample_transcripts(file_path: str = None) -> 'pd.DataFrame':
     """
     Load sample transcripts from Excel file
     
     Args:
-        file_path: Path to Excel file (default: data/Case study for interns.xlsx)
+        file_path: Path to Excel file (default: data/scoring_data.xlsx if present,
+            else data/Case study for interns.xlsx)
         
     Returns:
         DataFrame with transcript data
     """
     if file_path is None:
-        file_path = Path(__file__).parent.parent / "data" / "Case study for interns.xlsx"
+        file_path = SIDECAR_DATA_FILE if SIDECAR_DATA_FILE.exists() else DEFAULT_DATA_FILE
     
     try:
-        df = pd.read_excel(file_path, sheet_name='Transcripts')
+        df = _read_sheet(file_path, 'Transcripts')
         return df
     except FileNotFoundError:
         raise FileNotFoundError(f"Transcripts file not found at {file_path}")
@@ -54,17 +179,34 @@ def parse_keywords(keyword_string: str) -> List[str]:
     """
     Parse comma-separated keyword string into list
     
+    Keywords are lower-cased and interned here, once per rubric string, so
+    matchers only need to lower-case the transcript.
+    
     Args:
         keyword_string: Comma-separated keywords
         
     Returns:
-        List of individual keywords
+        List of individual lower-case keywords
     """
-    if pd.isna(keyword_string) or not keyword_string:
+    # Blank cells arrive as None or NaN (NaN is the only value unequal to itself)
+    if not keyword_string or (isinstance(keyword_string, float) and keyword_string != keyword_string):
         return []
     
-    keywords = [k.strip() for k in str(keyword_string).split(',')]
-    return [k for k in keywords if k]
+    return list(_split_keywords(str(keyword_string)))
+
+
+@lru_cache(maxsize=256)
+def _split_keywords(keyword_string: str) -> tuple:
+    """
+    Split a keyword string once; rubric strings repeat, so results are cached
+    
+    Args:
+        keyword_string: Comma-separated keywords
+        
+    Returns:
+        Tuple of stripped, lower-cased, interned non-empty keywords
+    """
+    return tuple(sys.intern(k) for k in (k.strip().lower() for k in keyword_string.split(',')) if k)
 
 
 def normalize_score(score: float, min_val: float = 0, max_val: float = 100) -> float:
@@ -82,26 +224,68 @@ def normalize_score(score: float, min_val: float = 0, max_val: float = 100) -> f
     return max(min_val, min(max_val, score))
 
 
+def clip_0_100(score: float) -> float:
+    """
+    Clamp a score to the default 0-100 range (fast path of normalize_score)
+    
+    Args:
+        score: Raw score
+        
+    Returns:
+        Score as a float within 0-100
+    """
+    return 0.0 if score < 0 else (100.0 if score > 100 else float(score))
+
+
+def clip_0_100_array(scores: np.ndarray) -> np.ndarray:
+    """
+    Clamp a float array of scores to 0-100 in place, without allocating a copy
+    
+    Args:
+        scores: Float array of raw scores (modified in place)
+        
+    Returns:
+        The same array, clamped
+    """
+    return np.clip(scores, 0, 100, out=scores)
+
+
+def normalize_scores(scores, min_val: float = 0, max_val: float = 100) -> np.ndarray:
+    """
+    Normalize many scores to be within min and max range
+    
+    Args:
+        scores: Array-like of raw scores
+        min_val: Minimum value
+        max_val: Maximum value
+        
+    Returns:
+        Float array of normalized scores
+    """
+    return np.clip(np.asarray(scores, dtype=np.float64), min_val, max_val)
+
+
 def calculate_weighted_average(scores: List[float], weights: List[float]) -> float:
     """
     Calculate weighted average of scores
     
     Args:
-        scores: List of scores
-        weights: List of weights (same length as scores)
+        scores: List or array of scores
+        weights: List or array of weights (same length as scores)
         
     Returns:
         Weighted average
     """
-    if not scores or not weights or len(scores) != len(weights):
+    s = np.asarray(scores, dtype=np.float64)
+    w = np.asarray(weights, dtype=np.float64)
+    if s.size == 0 or w.size == 0 or s.shape != w.shape:
         return 0.0
     
-    total_weight = sum(weights)
+    total_weight = w.sum()
     if total_weight == 0:
         return 0.0
     
-    weighted_sum = sum(s * w for s, w in zip(scores, weights))
-    return weighted_sum / total_weight
+    return float(s @ w / total_weight)
 
 
 def format_feedback(criterion: str, score: float, keywords_found: List[str], 
@@ -123,48 +307,33 @@ def format_feedback(criterion: str, score: float, keywords_found: List[str],
     Returns:
         Formatted feedback string
     """
-    feedback_parts = []
-    
     # Overall assessment
-    if score >= 90:
-        feedback_parts.append("Excellent performance.")
-    elif score >= 75:
-        feedback_parts.append("Good performance.")
-    elif score >= 60:
-        feedback_parts.append("Satisfactory performance.")
-    elif score >= 40:
-        feedback_parts.append("Needs improvement.")
-    else:
-        feedback_parts.append("Requires significant improvement.")
+    feedback_parts = [_PERF_MSGS[bisect_right(_PERF_CUTS, score)]]
     
     # Keyword feedback
-    if keywords_found:
-        if len(keywords_found) > 3:
-            feedback_parts.append(f"Strong keyword coverage with terms like '{keywords_found[0]}', '{keywords_found[1]}', and {len(keywords_found)-2} more.")
-        else:
-            feedback_parts.append(f"Found keywords: {', '.join(keywords_found[:3])}.")
+    num_found = len(keywords_found)
+    if num_found > 3:
+        feedback_parts.append(_TPL_KW_MANY(keywords_found[0], keywords_found[1], num_found - 2))
+    elif num_found:
+        feedback_parts.append(_TPL_KW_FEW(', '.join(keywords_found)))
     
-    if keywords_missing and len(keywords_missing) <= 3:
-        feedback_parts.append(f"Consider including: {', '.join(keywords_missing)}.")
-    elif keywords_missing:
-        feedback_parts.append(f"Missing {len(keywords_missing)} suggested keywords.")
+    num_missing = len(keywords_missing)
+    if num_missing > 3:
+        feedback_parts.append(_TPL_MISSING_MANY(num_missing))
+    elif num_missing:
+        feedback_parts.append(_TPL_MISSING_FEW(', '.join(keywords_missing)))
     
     # Semantic similarity feedback
-    if semantic_similarity >= 0.75:
-        feedback_parts.append("Strong semantic alignment with criterion.")
-    elif semantic_similarity >= 0.5:
-        feedback_parts.append("Moderate semantic relevance.")
-    elif semantic_similarity < 0.5:
-        feedback_parts.append("Consider addressing this aspect more directly.")
+    feedback_parts.append(_SEM_MSGS[bisect_right(_SEM_CUTS, semantic_similarity)])
     
     # Word count feedback
     if min_words > 0 and max_words < 999:
         if word_count < min_words:
-            feedback_parts.append(f"Content is brief ({word_count} words). Consider expanding (recommended: {min_words}+ words).")
+            feedback_parts.append(_TPL_BRIEF(word_count, min_words))
         elif word_count > max_words:
-            feedback_parts.append(f"Content is lengthy ({word_count} words). Consider being more concise (recommended: under {max_words} words).")
+            feedback_parts.append(_TPL_LENGTHY(word_count, max_words))
         else:
-            feedback_parts.append(f"Good length ({word_count} words).")
+            feedback_parts.append(_TPL_GOOD_LENGTH(word_count))
     
     return " ".join(feedback_parts)
 
@@ -202,7 +371,8 @@ def validate_transcript(transcript: str) -> Dict[str, Any]:
     Returns:
         Dictionary with validation result and message
     """
-    if not transcript or not transcript.strip():
+    # isspace() answers the blank check without copying the text like strip() would
+    if not transcript or transcript.isspace():
         return {
             'valid': False,
             'message': 'Transcript is empty'
@@ -229,6 +399,25 @@ def validate_transcript(transcript: str) -> Dict[str, Any]:
     }
 
 
+def validate_transcripts(transcripts: 'pd.Series') -> 'pd.DataFrame':
+    """
+    Validate a column of transcripts with the same word limits as validate_transcript
+    
+    Args:
+        transcripts: Series of transcript texts
+        
+    Returns:
+        DataFrame (same index) with 'valid' and 'word_count' columns
+    """
+    import pandas as pd
+    
+    word_count = transcripts.fillna('').astype(str).str.split().str.len()
+    return pd.DataFrame({
+        'valid': (word_count >= 10) & (word_count <= 5000),
+        'word_count': word_count
+    })
+
+
 def get_score_category(score: float) -> str:
     """
     Categorize score into performance level
@@ -239,18 +428,20 @@ def get_score_category(score: float) -> str:
     Returns:
         Category string
     """
-    if score >= 90:
-        return 'Excellent'
-    elif score >= 80:
-        return 'Very Good'
-    elif score >= 70:
-        return 'Good'
-    elif score >= 60:
-        return 'Satisfactory'
-    elif score >= 50:
-        return 'Fair'
-    else:
-        return 'Needs Improvement'
+    return _NAMES[bisect_right(_CUTS, score)]
+
+
+def get_score_category_array(scores) -> np.ndarray:
+    """
+    Categorize many scores at once
+    
+    Args:
+        scores: Array-like of score values (0-100)
+        
+    Returns:
+        Array of category strings, one per score
+    """
+    return SCORE_CATEGORY_NAMES[np.searchsorted(_CUTS, np.asarray(scores), side='right')]
 
 
 def format_timestamp() -> str:
@@ -260,5 +451,4 @@ def format_timestamp() -> str:
     Returns:
         ISO formatted timestamp string
     """
-    from datetime import datetime
-    return datetime.utcnow().isoformat() + 'Z'
+    return datetime.now(timezone.utc).isoformat().replace('+00:00', 'Z')
@@ -0,0 +1,6 @@
+"""
+WSGI entry point for production servers
+Run from the project root with:
+    gunicorn --chdir backend -w 2 --threads 8 -b 0.0.0.0:5000 wsgi:app
+"""
+from app import app
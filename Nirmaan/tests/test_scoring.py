@@ -1,78 +1,151 @@
 """
 Unit tests for the scoring system
 Run with: python -m pytest tests/test_scoring.py
+In parallel (pytest-xdist): python -m pytest -n auto tests/
 Or: python tests/test_scoring.py
 """
 import sys
 from pathlib import Path
 
-# Add parent directory to path
-sys.path.insert(0, str(Path(__file__).parent.parent))
+# Add backend directory to path (backend modules import each other by flat name)
+sys.path.insert(0, str(Path(__file__).parent.parent / "backend"))
 
-import unittest
-from backend.scoring_engine import ScoringEngine
-from backend.nlp_processor import NLPProcessor
-from backend.utils import (
-    parse_keywords, normalize_score, calculate_weighted_average,
-    validate_transcript, get_score_category
+import threading
+import numpy as np
+import pandas as pd
+import pytest
+from batching import BatchingEncoder
+from scoring_engine import ScoringEngine, clip_and_categorize
+from nlp_processor import get_nlp_processor
+from utils import (
+    parse_keywords, normalize_score, normalize_scores, clip_0_100, clip_0_100_array,
+    calculate_weighted_average,
+    validate_transcript, validate_transcripts, get_score_category,
+    get_score_category_array, get_word_count_status
 )
 
 
-class TestNLPProcessor(unittest.TestCase):
+# Loaded once per test process (once per worker under pytest -n)
+@pytest.fixture(scope='session')
+def nlp():
+    return get_nlp_processor()
+
+
+@pytest.fixture(scope='session')
+def engine():
+    return ScoringEngine()
+
+
+class TestNLPProcessor:
     """Test NLP processing functions"""
     
-    @classmethod
-    def setUpClass(cls):
-        cls.nlp = NLPProcessor()
-    
-    def test_preprocess_text(self):
+    def test_preprocess_text(self, nlp):
         """Test text preprocessing"""
         text = "  Hello   world!  Extra   spaces.  "
-        result = self.nlp.preprocess_text(text)
-        self.assertEqual(result, "Hello world! Extra spaces.")
+        result = nlp.preprocess_text(text)
+        assert result == "Hello world! Extra spaces."
     
-    def test_count_words(self):
+    def test_count_words(self, nlp):
         """Test word counting"""
         text = "Hello world, this is a test!"
-        count = self.nlp.count_words(text)
-        self.assertEqual(count, 6)
+        count = nlp.count_words(text)
+        assert count == 6
+    
+    def test_count_words_accented(self, nlp):
+        """Test non-ASCII letters do not split words"""
+        text = "Hello, I am José Müller and I am naïve."
+        assert nlp.count_words(text) == 9
+        assert nlp.analyze_text_quality(text)['unique_words'] == 7
     
-    def test_calculate_similarity(self):
+    def test_analyze_text_quality(self, nlp):
+        """Test text quality metrics"""
+        result = nlp.analyze_text_quality("Hello world. Hello again! ")
+        assert result['word_count'] == 4
+        assert result['sentence_count'] == 2
+        assert result['unique_words'] == 3
+        assert result['avg_sentence_length'] == pytest.approx(2.0)
+        assert result['vocabulary_richness'] == pytest.approx(0.75)
+
+    def test_calculate_similarity(self, nlp):
         """Test semantic similarity calculation"""
         text1 = "I love programming in Python"
         text2 = "I enjoy coding with Python"
-        similarity = self.nlp.calculate_similarity(text1, text2)
-        self.assertGreater(similarity, 0.5)
-        self.assertLessEqual(similarity, 1.0)
-    
-    def test_find_keyword_matches(self):
+        similarity = nlp.calculate_similarity(text1, text2)
+        assert similarity > 0.5
+        assert similarity <= 1.0
+
+    def test_encode_normalized(self, nlp):
+        """Test normalized embeddings have unit length"""
+        emb = nlp.encode_normalized("I love programming in Python")
+        assert float((emb ** 2).sum()) == pytest.approx(1.0, abs=5e-5)
+
+    def test_get_embedding_cached(self, nlp):
+        """Test repeated texts are served from the embedding cache"""
+        text = "Hello, my name is Priya and I enjoy painting."
+        first = nlp.get_embedding(text)
+        assert nlp.get_embedding(text) is first
+
+        batch = nlp.encode_batch([text, "A different sentence.", text])
+        assert batch.shape[0] == 3
+        assert (batch[0] == first).all()
+        assert (batch[2] == first).all()
+
+    def test_score_semantic_relevance(self, nlp):
+        """Test relevance equals the mean of pairwise similarities"""
+        text = "I love programming in Python"
+        refs = ["I enjoy coding with Python", "The weather is nice today"]
+        relevance = nlp.score_semantic_relevance(text, refs)
+        expected = sum(nlp.calculate_similarity(text, r) for r in refs) / len(refs)
+        assert relevance == pytest.approx(expected, abs=5e-5)
+        assert nlp.score_semantic_relevance(text, []) == 0.0
+
+    def test_find_keyword_matches(self, nlp):
         """Test keyword matching"""
         text = "Hello my name is John and I love programming"
         keywords = ["hello", "name", "programming", "missing"]
-        result = self.nlp.find_keyword_matches(text, keywords)
+        result = nlp.find_keyword_matches(text, keywords)
         
-        self.assertIn("hello", result['found'])
-        self.assertIn("name", result['found'])
-        self.assertIn("programming", result['found'])
-        self.assertIn("missing", result['missing'])
+        assert "hello" in result['found']
+        assert "name" in result['found']
+        assert "programming" in result['found']
+        assert "missing" in result['missing']
 
 
-class TestUtilityFunctions(unittest.TestCase):
+class TestUtilityFunctions:
     """Test utility functions"""
     
     def test_parse_keywords(self):
         """Test keyword parsing"""
         keyword_string = "hello, world, test, python"
         result = parse_keywords(keyword_string)
-        self.assertEqual(len(result), 4)
-        self.assertIn("hello", result)
-        self.assertIn("python", result)
+        assert len(result) == 4
+        assert "hello" in result
+        assert "python" in result
+    
+    def test_parse_keywords_blank(self):
+        """Test blank rubric cells parse to no keywords"""
+        assert parse_keywords(float('nan')) == []
+        assert parse_keywords(None) == []
+        assert parse_keywords("") == []
+    
+    def test_parse_keywords_lowercase(self):
+        """Test keywords are lower-cased at parse time"""
+        assert parse_keywords("Hello, Name IS") == ["hello", "name", "is"]
     
     def test_normalize_score(self):
         """Test score normalization"""
-        self.assertEqual(normalize_score(50), 50)
-        self.assertEqual(normalize_score(-10), 0)
-        self.assertEqual(normalize_score(150), 100)
+        assert normalize_score(50) == 50
+        assert normalize_score(-10) == 0
+        assert normalize_score(150) == 100
+    
+    def test_clip_0_100(self):
+        """Test the 0-100 fast paths agree with normalize_score"""
+        for score in (50, -10, 150, 0, 100, 99.5):
+            assert clip_0_100(score) == normalize_score(score)
+        
+        scores = np.array([50.0, -10.0, 150.0])
+        assert clip_0_100_array(scores) is scores
+        np.testing.assert_array_equal(scores, [50.0, 0.0, 100.0])
     
     def test_calculate_weighted_average(self):
         """Test weighted average calculation"""
@@ -80,36 +153,114 @@ class TestUtilityFunctions(unittest.TestCase):
         weights = [2, 3, 1]
         avg = calculate_weighted_average(scores, weights)
         expected = (80*2 + 90*3 + 70*1) / (2+3+1)
-        self.assertAlmostEqual(avg, expected, places=2)
+        assert avg == pytest.approx(expected, abs=5e-3)
     
     def test_validate_transcript_valid(self):
         """Test transcript validation with valid input"""
         transcript = "This is a valid transcript with more than ten words in it."
         result = validate_transcript(transcript)
-        self.assertTrue(result['valid'])
+        assert result['valid']
     
     def test_validate_transcript_too_short(self):
         """Test transcript validation with short input"""
         transcript = "Too short"
         result = validate_transcript(transcript)
-        self.assertFalse(result['valid'])
+        assert not result['valid']
+    
+    def test_validate_transcripts(self):
+        """Test column validation agrees with the scalar validator"""
+        texts = pd.Series([
+            "This is a valid transcript with more than ten words in it.",
+            "Too short",
+            "",
+        ])
+        result = validate_transcripts(texts)
+        assert list(result['valid']) == [validate_transcript(t)['valid'] for t in texts]
+        assert result['word_count'].iloc[0] == 12
+    
+    def test_normalize_scores(self):
+        """Test array score normalization"""
+        np.testing.assert_array_equal(normalize_scores([50, -10, 150]), [50.0, 0.0, 100.0])
     
     def test_get_score_category(self):
         """Test score categorization"""
-        self.assertEqual(get_score_category(95), 'Excellent')
-        self.assertEqual(get_score_category(85), 'Very Good')
-        self.assertEqual(get_score_category(75), 'Good')
-        self.assertEqual(get_score_category(45), 'Needs Improvement')
+        assert get_score_category(95) == 'Excellent'
+        assert get_score_category(85) == 'Very Good'
+        assert get_score_category(75) == 'Good'
+        assert get_score_category(45) == 'Needs Improvement'
+    
+    def test_get_score_category_array(self):
+        """Test batched categorization matches the scalar ladder"""
+        scores = [95, 90, 89.9, 75, 50, 45]
+        assert list(get_score_category_array(scores)) == [get_score_category(s) for s in scores]
+    
+    def test_clip_and_categorize(self):
+        """Test the compiled kernel clamps before categorizing"""
+        categories, clipped = clip_and_categorize([95, 89.9, 50, -10, 150])
+        assert list(categories) == ['Excellent', 'Very Good', 'Fair', 'Needs Improvement', 'Excellent']
+        np.testing.assert_array_equal(clipped, [95.0, 89.9, 50.0, 0.0, 100.0])
 
 
-class TestScoringEngine(unittest.TestCase):
-    """Test scoring engine"""
+class TestBatchingEncoder:
+    """Test micro-batching of concurrent encode requests"""
+    
+    class _FakeNLP:
+        def __init__(self):
+            self.batch_sizes = []
+            self.gate = threading.Event()
+        
+        def lookup_embedding(self, text):
+            return None
+        
+        def encode_batch(self, texts):
+            self.gate.wait(timeout=5)
+            self.batch_sizes.append(len(texts))
+            return np.array([[float(len(t))] for t in texts])
     
-    @classmethod
-    def setUpClass(cls):
-        cls.engine = ScoringEngine()
+    def test_submit_batches_pending_texts(self):
+        """Test texts queued while the model is busy are encoded in one call"""
+        nlp = self._FakeNLP()
+        encoder = BatchingEncoder(nlp, max_batch=8)
+        futures = [encoder.submit("x" * n) for n in range(1, 6)]
+        nlp.gate.set()
+        
+        results = [f.result(timeout=5) for f in futures]
+        encoder.close()
+        
+        assert [r[0] for r in results] == [1.0, 2.0, 3.0, 4.0, 5.0]
+        assert sum(nlp.batch_sizes) == 5
+        assert len(nlp.batch_sizes) <= 2
+
+
+class TestCacheHeaders:
+    """Test static asset and HTML page caching headers"""
     
-    def test_score_transcript_basic(self):
+    @pytest.fixture
+    def client(self):
+        from app import app
+        return app.test_client()
+    
+    def test_index_revalidates(self, client):
+        """Test the HTML page is not cached as a public one-day asset"""
+        response = client.get('/')
+        assert response.status_code == 200
+        assert response.cache_control.no_cache
+        assert not response.cache_control.public
+        assert response.cache_control.max_age is None
+        assert response.expires is None
+    
+    def test_static_asset_cached(self, client):
+        """Test other static files are publicly cacheable"""
+        response = client.get('/styles.css')
+        assert response.status_code == 200
+        assert response.cache_control.public
+        assert response.cache_control.max_age == 86400
+
+
+class TestScoringEngine:
+    """Test scoring engine"""
+    
+    def test_score_transcript_basic(self, engine):
         """Test basic transcript scoring"""
         transcript = """
         Hello everyone! My name is Sarah Johnson, and I'm excited to introduce myself.
@@ -119,27 +270,27 @@ class TestScoringEngine(unittest.TestCase):
         technology and innovation. Thank you for your time!
         """
         
-        result = self.engine.score_transcript(transcript)
+        result = engine.score_transcript(transcript)
         
         # Check that result has expected structure
-        self.assertIn('overall_score', result)
-        self.assertIn('criteria_scores', result)
-        self.assertIn('word_count', result)
+        assert 'overall_score' in result
+        assert 'criteria_scores' in result
+        assert 'word_count' in result
         
         # Check score is in valid range
-        self.assertGreaterEqual(result['overall_score'], 0)
-        self.assertLessEqual(result['overall_score'], 100)
+        assert result['overall_score'] >= 0
+        assert result['overall_score'] <= 100
         
         # Check criteria scores
-        self.assertGreater(len(result['criteria_scores']), 0)
+        assert len(result['criteria_scores']) > 0
         
         for criterion in result['criteria_scores']:
-            self.assertIn('criterion', criterion)
-            self.assertIn('score', criterion)
-            self.assertIn('weight', criterion)
-            self.assertIn('feedback', criterion)
+            assert 'criterion' in criterion
+            assert 'score' in criterion
+            assert 'weight' in criterion
+            assert 'feedback' in criterion
     
-    def test_score_transcript_excellent(self):
+    def test_score_transcript_excellent(self, engine):
         """Test scoring of excellent transcript"""
         transcript = """
         Good morning everyone! My name is Alex Thompson, and it's a pleasure to introduce myself today.
@@ -167,67 +318,84 @@ class TestScoringEngine(unittest.TestCase):
         have any questions or would like to discuss potential opportunities!
         """
         
-        result = self.engine.score_transcript(transcript)
+        result = engine.score_transcript(transcript)
         
         # Excellent transcript should score high
-        self.assertGreater(result['overall_score'], 70)
+        assert result['overall_score'] > 70
         
         # Should find many keywords
         for criterion in result['criteria_scores']:
             if len(criterion['keywords_found']) > 0:
-                self.assertGreater(len(criterion['keywords_found']), 0)
+                assert len(criterion['keywords_found']) > 0
     
-    def test_score_transcript_poor(self):
+    def test_score_transcript_poor(self, engine):
         """Test scoring of poor transcript"""
         transcript = "Hi. I'm John. I studied computer science. Looking for a job."
         
-        result = self.engine.score_transcript(transcript)
+        result = engine.score_transcript(transcript)
         
         # Poor transcript should score lower
-        self.assertLess(result['overall_score'], 70)
+        assert result['overall_score'] < 70
+
+    def test_score_transcripts_batch(self, engine):
+        """Test batch scoring matches individual scoring"""
+        transcripts = [
+            "Hello everyone! My name is Sarah, I am fifteen years old and I love to play football with my family.",
+            "Hi. I'm John. I studied computer science. Looking for a job."
+        ]
+
+        results = engine.score_transcripts(transcripts)
+
+        assert len(results) == len(transcripts)
+        for transcript, result in zip(transcripts, results):
+            single = engine.score_transcript(transcript)
+            assert result['overall_score'] == pytest.approx(single['overall_score'], abs=5e-2)
+
+        assert engine.score_transcripts([]) == []
     
-    def test_get_rubric_info(self):
-        """Test getting rubric information"""
-        info = self.engine.get_rubric_info()
+    def test_score_transcripts_return_exceptions(self, engine, monkeypatch):
+        """Test one failing transcript does not fail the rest of the batch"""
+        score_preprocessed = engine._score_preprocessed
         
-        self.assertIn('criteria_count', info)
-        self.assertIn('total_weight', info)
-        self.assertIn('criteria', info)
+        def flaky(transcript, sims):
+            if 'John' in transcript:
+                raise ValueError("boom")
+            return score_preprocessed(transcript, sims)
         
-        self.assertGreater(info['criteria_count'], 0)
-        self.assertGreater(info['total_weight'], 0)
-
+        monkeypatch.setattr(engine, '_score_preprocessed', flaky)
+        transcripts = [
+            "Hello everyone! My name is Sarah, I am fifteen years old and I love to play football.",
+            "Hi. I'm John. I studied computer science. Looking for a job."
+        ]
+        
+        results = engine.score_transcripts(transcripts, return_exceptions=True)
+        assert 'overall_score' in results[0]
+        assert isinstance(results[1], ValueError)
+        with pytest.raises(ValueError):
+            engine.score_transcripts(transcripts)
 
-def run_tests():
-    """Run all tests"""
-    print("=" * 60)
-    print("Running Communication Skills Scoring System Tests")
-    print("=" * 60)
-    
-    # Create test suite
-    loader = unittest.TestLoader()
-    suite = unittest.TestSuite()
-    
-    # Add test classes
-    suite.addTests(loader.loadTestsFromTestCase(TestNLPProcessor))
-    suite.addTests(loader.loadTestsFromTestCase(TestUtilityFunctions))
-    suite.addTests(loader.loadTestsFromTestCase(TestScoringEngine))
-    
-    # Run tests
-    runner = unittest.TextTestRunner(verbosity=2)
-    result = runner.run(suite)
-    
-    # Print summary
-    print("\n" + "=" * 60)
-    print(f"Tests run: {result.testsRun}")
-    print(f"Failures: {len(result.failures)}")
-    print(f"Errors: {len(result.errors)}")
-    print(f"Success: {result.wasSuccessful()}")
-    print("=" * 60)
+    def test_word_count_status_per_criterion(self, engine):
+        """Test vectorized word count statuses match the scalar helper"""
+        transcript = "Hello everyone, my name is Sarah and I am excited to be here today."
+        result = engine.score_transcript(transcript)
+        
+        for i, criterion in enumerate(result['criteria_scores']):
+            expected = get_word_count_status(
+                result['word_count'], engine.min_words[i], engine.max_words[i]
+            )
+            assert criterion['word_count_status'] == expected
     
-    return result.wasSuccessful()
+    def test_get_rubric_info(self, engine):
+        """Test getting rubric information"""
+        info = engine.get_rubric_info()
+        
+        assert 'criteria_count' in info
+        assert 'total_weight' in info
+        assert 'criteria' in info
+        
+        assert info['criteria_count'] > 0
+        assert info['total_weight'] > 0
 
 
 if __name__ == '__main__':
-    success = run_tests()
-    sys.exit(0 if success else 1)
+    sys.exit(pytest.main([__file__, '-v']))